@@ -1,38 +1,222 @@
 """
-Simple OSM Renderer using Folium
+Simple OSM Renderer using Leaflet
 
-A Python package for rendering OpenStreetMap data and custom routes using Folium maps.
+A Python package for rendering OpenStreetMap data and custom routes as Leaflet maps.
 """
 
+import gzip
+import hashlib
 import json
 import os
-import folium
+import shutil
+from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from itertools import islice
+import numpy as np
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional
+    ijson = None
 
 # Constants
 GOOGLE_MAPS_API_KEY = os.getenv('GOOGLE_MAPS_API_KEY', '')
 DEFAULT_INPUT_FILE = "route.json"
 DEFAULT_OUTPUT_DIR = "route_output"
 
-def summarize_frames(frames: List[Dict]) -> str:
-    """
-    Generate an HTML summary of all frames/events.
-    
-    Args:
-        frames: List of frame dictionaries from JSON input
-        
-    Returns:
-        HTML string with all frames listed
-    """
-    html = []
-    html.append("<!DOCTYPE html>")
-    html.append("<html>")
-    html.append("<head>")
-    html.append("<meta charset='utf-8' />")
-    html.append("<title>All Frames</title>")
-    html.append("<style>")
-    html.append("""
+# Frames sent to a worker process per task; amortizes pickling and IPC per submit
+_FRAMES_PER_TASK = 16
+
+_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+_JS_ESCAPE_TABLE = str.maketrans({"&": "\\u0026", "<": "\\u003c", ">": "\\u003e", "'": "\\u0027"})
+
+def _tojson(obj) -> str:
+    """JSON literal that is safe to embed in an HTML <script> block."""
+    return json.dumps(obj).translate(_JS_ESCAPE_TABLE)
+
+# Named marker colors (the Leaflet.awesome-markers palette Folium exposes) and their RGB values
+_COLOR_NAMES = (
+    "red", "blue", "green", "purple", "orange", "darkred", "lightred", "beige",
+    "darkblue", "darkgreen", "cadetblue", "darkpurple", "white", "pink",
+    "lightblue", "lightgreen", "gray", "black", "lightgray", "yellow",
+)
+_COLOR_RGB = np.array([
+    [255, 0, 0], [0, 0, 255], [0, 255, 0], [128, 0, 128], [255, 165, 0],
+    [139, 0, 0], [255, 102, 102], [245, 245, 220], [0, 0, 139], [0, 100, 0],
+    [95, 158, 160], [48, 25, 52], [255, 255, 255], [255, 192, 203],
+    [173, 216, 230], [144, 238, 144], [128, 128, 128], [0, 0, 0],
+    [211, 211, 211], [255, 255, 0],
+], dtype=np.int32)
+
+# Two-digit lowercase hex string -> channel value
+_HEX = {f"{i:02x}": i for i in range(256)}
+
+_OSM_TILES_URL = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+_OSM_TILES_OPTIONS = {
+    "maxZoom": 19,
+    "attribution": '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors',
+}
+
+# Leaflet page shared by all frames (Leaflet.awesome-markers + Font Awesome for the icons);
+# the tile layer is filled in at /*TILES*/ (see _page_head), the per-frame script is spliced in at /*FRAME_JS*/
+_LEAFLET_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta http-equiv="content-type" content="text/html; charset=UTF-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no" />
+    <script src="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"></script>
+    <script src="https://cdnjs.cloudflare.com/ajax/libs/Leaflet.awesome-markers/2.0.2/leaflet.awesome-markers.js"></script>
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css"/>
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@6.2.0/css/all.min.css"/>
+    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/Leaflet.awesome-markers/2.0.2/leaflet.awesome-markers.css"/>
+    <style>
+        html, body { width: 100%; height: 100%; margin: 0; padding: 0; }
+        #map { position: absolute; top: 0; bottom: 0; right: 0; left: 0; }
+        .leaflet-container { font-size: 1rem; }
+    </style>
+</head>
+<body>
+    <div id="map"></div>
+    <script>
+        var map = L.map("map", {center: [0.0, 0.0], zoom: 1});
+        L.tileLayer(/*TILES*/).addTo(map);
+/*FRAME_JS*/
+    </script>
+</body>
+</html>"""
+
+# Per-frame script lines (str.format templates, literal braces are doubled)
+_MARKER_JS = (
+    '        L.marker({location}, {{icon: L.AwesomeMarkers.icon({{markerColor: {color}, iconColor: "white", '
+    'icon: {icon}, prefix: "fa"}})}}).addTo(map).bindPopup({popup}, {{maxWidth: "100%"}});\n'
+)
+_LINE_JS = '        L.polyline({locations}, {{color: {color}, weight: 4}}).addTo(map);\n'
+_FIT_BOUNDS_JS = '        map.fitBounds({bounds});\n'
+
+_PAGE_HEAD, _PAGE_TAIL = _LEAFLET_PAGE_TEMPLATE.split("/*FRAME_JS*/\n")
+
+def _tiles_js() -> str:
+    """L.tileLayer arguments: Google Maps if GOOGLE_MAPS_API_KEY is set, OpenStreetMap otherwise."""
+    if GOOGLE_MAPS_API_KEY:
+        url = f"https://mt1.google.com/vt/lyrs=m&x={{x}}&y={{y}}&z={{z}}&key={GOOGLE_MAPS_API_KEY}"
+        return f"{_tojson(url)}, {_tojson({'attribution': 'Google Maps'})}"
+    return f"{_tojson(_OSM_TILES_URL)}, {_tojson(_OSM_TILES_OPTIONS)}"
+
+@lru_cache(maxsize=4)
+def _page_head(tiles_js: str) -> str:
+    """Frame page head up to the per-frame script, with the tile layer filled in."""
+    return _PAGE_HEAD.replace("/*TILES*/", tiles_js)
+
+# Tag defaults and popup text used when converting frames (see _to_soa)
+_DEFAULT_ICON = "info-sign"
+_DEFAULT_COLOR = "#0000FF"
+_POPUP_FORMAT = "{description} (icon: {icon})"
+
+# Bump when frame pages change in a way the constants below do not capture
+_OUTPUT_FORMAT_VERSION = "1"
+
+# Hash state seeded with everything that shapes a frame page besides the frame itself
+_RENDER_HASH = hashlib.blake2b(
+    "\0".join((
+        _OUTPUT_FORMAT_VERSION, _PAGE_HEAD, _MARKER_JS, _LINE_JS, _FIT_BOUNDS_JS, _PAGE_TAIL,
+        _DEFAULT_ICON, _DEFAULT_COLOR, _POPUP_FORMAT, ",".join(_COLOR_NAMES),
+    )).encode("utf-8") + _COLOR_RGB.tobytes()
+)
+
+# Single page holding every frame; Previous/Next redraws one layer group in place.
+# Split once at /*FRAMES*/, where the frame data is spliced in; the tile layer is filled in at /*TILES*/.
+_COMBINED_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta http-equiv="content-type" content="text/html; charset=UTF-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no" />
+    <title>Frames Combined View</title>
+    <script src="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"></script>
+    <script src="https://cdnjs.cloudflare.com/ajax/libs/Leaflet.awesome-markers/2.0.2/leaflet.awesome-markers.js"></script>
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css"/>
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@6.2.0/css/all.min.css"/>
+    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/Leaflet.awesome-markers/2.0.2/leaflet.awesome-markers.css"/>
+    <style>
+        html, body { width: 100%; height: 100%; margin: 0; padding: 0; }
+        body { display: flex; flex-direction: column; font-family: sans-serif; }
+        #controls { background: #ececec; padding: 5px; flex: 0 0 auto; }
+        #description { padding: 5px; flex: 0 0 auto; border-bottom: 1px solid #ccc; }
+        #map { flex: 1 1 auto; }
+        .leaflet-container { font-size: 1rem; }
+        button { margin: 0 10px; padding: 6px 12px; cursor: pointer; }
+    </style>
+</head>
+<body>
+    <div id="controls">
+        <button id="prevBtn">Previous</button>
+        <span id="info"></span>
+        <button id="nextBtn">Next</button>
+    </div>
+    <div id="description"></div>
+    <div id="map"></div>
+    <script>
+        var FRAMES = /*FRAMES*/;
+        var map = L.map("map", {center: [0.0, 0.0], zoom: 1});
+        L.tileLayer(/*TILES*/).addTo(map);
+        var layer = L.layerGroup().addTo(map);
+        var current = 0;
+        var maxIndex = FRAMES.length - 1;
+
+        function showFrame(i) {
+            var frame = FRAMES[i];
+            layer.clearLayers();
+            frame.tag_xy.forEach(function (xy, j) {
+                L.marker(xy, {icon: L.AwesomeMarkers.icon({markerColor: frame.tag_color[j], iconColor: "white", icon: frame.tag_icon[j], prefix: "fa"})})
+                    .bindPopup(frame.tag_popup[j], {maxWidth: "100%"}).addTo(layer);
+            });
+            frame.line_xy.forEach(function (xy, j) {
+                L.polyline([[xy[0], xy[1]], [xy[2], xy[3]]], {color: frame.line_color[j], weight: 4}).addTo(layer);
+            });
+            if (frame.bounds) {
+                map.flyToBounds(frame.bounds);
+            }
+            document.getElementById("info").textContent = "Frame " + i + " / " + maxIndex;
+            document.getElementById("description").textContent = frame.description;
+        }
+
+        document.getElementById("prevBtn").addEventListener("click", function () {
+            if (current > 0) {
+                current--;
+                showFrame(current);
+            }
+        });
+
+        document.getElementById("nextBtn").addEventListener("click", function () {
+            if (current < maxIndex) {
+                current++;
+                showFrame(current);
+            }
+        });
+
+        if (FRAMES.length) {
+            showFrame(current);
+        }
+    </script>
+</body>
+</html>"""
+
+_COMBINED_HEAD, _COMBINED_TAIL = _COMBINED_TEMPLATE.split("/*FRAMES*/")
+
+_HTML_HEADER = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset='utf-8' />
+<title>All Frames</title>
+<style>
+
       body { margin:0; padding:0; font-family: sans-serif; }
       h3 { background: #eee; margin: 0; padding: 8px; }
       .frameLine {
@@ -45,145 +229,21 @@ def summarize_frames(frames: List[Dict]) -> str:
       .frameLine:target {
         background-color: yellow;
       }
-    """)
-    html.append("</style>")
-    html.append("</head>")
-    html.append("<body>")
-    html.append("<h3>All Frames (Events)</h3>")
-    html.append("<div>")
-    for i, frame in enumerate(frames):
-        anchor_id = f"frame{i}"
-        desc_safe = frame["description"].replace("<", "&lt;").replace(">", "&gt;")
-        line_html = (
-            f"<a id='{anchor_id}' name='{anchor_id}' "
-            f"class='frameLine'>Frame {i}: {desc_safe}</a>"
-        )
-        html.append(line_html)
-    html.append("</div>")
-    html.append("</body>")
-    html.append("</html>")
-    return "\n".join(html)
-
-def color_hex_to_folium_icon(hex_color: str) -> str:
-    """
-    Convert hex color code to nearest named Folium icon color.
-
-    Args:
-        hex_color: Color in hex format (e.g., '#FF0000' or 'FF0000')
-
-    Returns:
-        Closest named Folium color (e.g., 'red')
-    """
-    # --- CHECK ---
-    if hex_color is None or not isinstance(hex_color, str) or not hex_color.strip():
-        return "blue" # Return the default blue color as per test expectation
-    # ----------------------
-
-    c = hex_color.strip().lower()
-    if c.startswith("#"):
-        c = c[1:]
-    if len(c) == 3:
-        c = "".join(ch*2 for ch in c)
-    
-    try:
-        r = int(c[0:2], 16)
-        g = int(c[2:4], 16)
-        b = int(c[4:6], 16)
-    except ValueError:
-        return "blue"
-    
-    named_colors = {
-        "red": (255, 0, 0), "blue": (0, 0, 255), "green": (0, 255, 0),
-        "purple": (128, 0, 128), "orange": (255, 165, 0), "darkred": (139, 0, 0),
-        "lightred": (255, 102, 102), "beige": (245, 245, 220),
-        "darkblue": (0, 0, 139), "darkgreen": (0, 100, 0),
-        "cadetblue": (95, 158, 160), "darkpurple": (48, 25, 52),
-        "white": (255, 255, 255), "pink": (255, 192, 203),
-        "lightblue": (173, 216, 230), "lightgreen": (144, 238, 144),
-        "gray": (128, 128, 128), "black": (0, 0, 0), "lightgray": (211, 211, 211),"yellow": (255, 255, 0),
-    }
-    
-    best_color = "blue"
-    best_dist = float("inf")
-    for name, (nr, ng, nb) in named_colors.items():
-        dist_sq = (r - nr)**2 + (g - ng)**2 + (b - nb)**2
-        if dist_sq < best_dist:
-            best_dist = dist_sq
-            best_color = name
-    return best_color
-
-def create_map_for_frame(frame: Dict, global_bounds: Optional[List[List[float]]], output_path: str) -> None:
-    """
-    Generate a Folium map for a single frame.
-    
-    Args:
-        frame: Dictionary containing frame data
-        global_bounds: Fallback map bounds [[min_lat, min_lng], [max_lat, max_lng]]
-        output_path: Path to save the HTML file
-    """
-    all_coords = []
-    for tag in frame.get("tags", []):
-        all_coords.append(tag["position"])
-    for line in frame.get("lines", []):
-        all_coords.append(line["start"])
-        all_coords.append(line["end"])
-    
-    # Initialize map with appropriate tiles
-    if GOOGLE_MAPS_API_KEY: 
-        tile_url = f"https://mt1.google.com/vt/lyrs=m&x={{x}}&y={{y}}&z={{z}}&key={GOOGLE_MAPS_API_KEY}"
-        m = folium.Map(tiles=None)
-        folium.TileLayer(
-            tiles=tile_url,
-            attr="Google Maps",
-            name="Google Maps",
-            control=True
-        ).add_to(m)
-    else:
-        m = folium.Map()
-    
-    # Set map bounds
-    if all_coords:
-        lats, lngs = zip(*all_coords)
-        frame_bounds = [[min(lats), min(lngs)], [max(lats), max(lngs)]]
-        m.fit_bounds(frame_bounds)
-    elif global_bounds:
-        m.fit_bounds(global_bounds)
-    
-    # Add markers
-    for tag in frame.get("tags", []):
-        lat, lng = tag["position"]
-        icon_type = tag.get("icon", "info-sign")
-        color_hex = tag.get("color", "#0000FF")
-        desc_text = tag.get("description", "")
-        folium_color = color_hex_to_folium_icon(color_hex)
-        popup_str = f"{desc_text} (icon: {icon_type})"
-        folium.Marker(
-            location=[lat, lng],
-            popup=popup_str,
-            icon=folium.Icon(color=folium_color, icon=icon_type, prefix="fa")
-        ).add_to(m)
     
-    # Add lines
-    for line in frame.get("lines", []):
-        folium.PolyLine(
-            locations=[line["start"], line["end"]],
-            color=line["color"],
-            weight=4
-        ).add_to(m)
+</style>
+</head>
+<body>
+<h3>All Frames (Events)</h3>
+<div>
+"""
 
-    m.save(output_path)
+_HTML_FOOTER = """
+</div>
+</body>
+</html>"""
 
-def generate_master_html(output_dir: str, total_frames: int) -> None:
-    """
-    Create the master HTML file that controls all frames.
-    
-    Args:
-        output_dir: Directory to save the file
-        total_frames: Number of frames available
-    """
-    master_html_path = os.path.join(output_dir, "_master.html")
-    with open(master_html_path, "w", encoding="utf-8") as f:
-        f.write(f"""<!DOCTYPE html>
+# Master view; only {total_frames} is substituted (literal braces are doubled)
+_MASTER_TEMPLATE = """<!DOCTYPE html>
 <html>
 <head>
   <meta charset="utf-8" />
@@ -261,61 +321,397 @@ def generate_master_html(output_dir: str, total_frames: int) -> None:
   </script>
 </body>
 </html>
-""")
+"""
+
+def summarize_frames(frames: List[Dict]) -> str:
+    """
+    Generate an HTML summary of all frames/events.
+    
+    Args:
+        frames: List of frame dictionaries from JSON input
+        
+    Returns:
+        HTML string with all frames listed
+    """
+    parts = []
+    append = parts.append
+    for i, frame in enumerate(frames):
+        desc_safe = frame["description"].translate(_ESCAPE_TABLE)
+        append(f"<a id='frame{i}' name='frame{i}' class='frameLine'>Frame {i}: {desc_safe}</a>")
+    return _HTML_HEADER + "\n".join(parts) + _HTML_FOOTER
+
+def color_hex_to_folium_icon(hex_color: str) -> str:
+    """
+    Convert hex color code to nearest named Folium icon color.
+
+    Args:
+        hex_color: Color in hex format (e.g., '#FF0000' or 'FF0000')
 
-def render_osm_maps(input_file: str = DEFAULT_INPUT_FILE, output_dir: str = DEFAULT_OUTPUT_DIR) -> None:
+    Returns:
+        Closest named Folium color (e.g., 'red')
+    """
+    # --- CHECK ---
+    if hex_color is None or not isinstance(hex_color, str) or not hex_color.strip():
+        return "blue" # Return the default blue color as per test expectation
+    # ----------------------
+    return _nearest_folium_color(hex_color)
+
+@lru_cache(maxsize=256)
+def _nearest_folium_color(hex_color: str) -> str:
+    """Cached worker for color_hex_to_folium_icon; expects a non-empty string."""
+    c = hex_color.strip().lower()
+    if c.startswith("#"):
+        c = c[1:]
+    if len(c) == 3:
+        c = "".join(ch*2 for ch in c)
+    
+    try:
+        r = _HEX[c[0:2]]
+        g = _HEX[c[2:4]]
+        b = _HEX[c[4:6]]
+    except KeyError:
+        return "blue"
+    
+    diff = _COLOR_RGB - np.array([r, g, b], dtype=np.int32)
+    idx = int((diff * diff).sum(axis=1).argmin())
+    return _COLOR_NAMES[idx]
+
+class _FrameStream:
+    """Re-iterable view of the frames in a JSON file, parsed incrementally with ijson."""
+
+    def __init__(self, input_file: str) -> None:
+        self.input_file = input_file
+
+    def __iter__(self) -> Iterator[Dict]:
+        empty = True
+        with open(self.input_file, "rb") as f:
+            for frame in ijson.items(f, "frames.item", use_float=True):
+                empty = False
+                yield frame
+        # ijson yields nothing for a missing key; fail like json.load(f)["frames"] does
+        if empty and not self._has_frames():
+            raise KeyError("frames")
+
+    def _has_frames(self) -> bool:
+        """Whether the top-level object has a "frames" key."""
+        with open(self.input_file, "rb") as f:
+            return any(prefix == "frames" for prefix, _, _ in ijson.parse(f))
+
+def _load_frames(input_file: str) -> Iterable[Dict]:
+    """
+    Load the frames of a JSON input file.
+
+    With ijson installed the frames are streamed from disk on each iteration
+    instead of being loaded at once, so large inputs stay out of memory.
+    """
+    if ijson is not None:
+        return _FrameStream(input_file)
+    with open(input_file, "r", encoding="utf-8") as f:
+        return json.load(f)["frames"]
+
+def _dumps_json(obj) -> str:
+    """Serialize obj as compact JSON, using orjson (with NumPy support) when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=np.ndarray.tolist)
+
+def _frame_key(frame: Dict, global_bounds: Optional[List[List[float]]], tiles_js: str) -> str:
+    """
+    Content hash of everything drawn on a frame's map page.
+
+    Covers the output format (_RENDER_HASH: templates, color palette, tag
+    defaults, popup format), the tile layer, the tags and lines, and the global
+    bounds for frames that have no points of their own. The frame
+    description is not drawn on the map and is left out.
+    """
+    tags = frame.get("tags", [])
+    lines = frame.get("lines", [])
+    content = _dumps_json([tags, lines, None if tags or lines else global_bounds])
+    key = _RENDER_HASH.copy()
+    key.update(tiles_js.encode("utf-8"))
+    key.update(content.encode("utf-8"))
+    return key.hexdigest()
+
+def _link_or_copy(source: str, target: str) -> None:
+    """Hard-link target to source, copying where hard links are not supported."""
+    try:
+        os.remove(target)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+def _write_html(output_path: str, html: str, compress: bool = False) -> None:
+    """Write an HTML document, gzip-compressed to output_path + '.gz' if requested."""
+    data = html.encode("utf-8")
+    if compress:
+        output_path += ".gz"
+        data = gzip.compress(data, compresslevel=6)
+    # Replace instead of overwriting in place: the file may be a hard link shared with other frames
+    try:
+        os.remove(output_path)
+    except FileNotFoundError:
+        pass
+    Path(output_path).write_bytes(data)
+
+@dataclass
+class _FrameArrays:
+    """Structure-of-arrays form of one frame: everything drawn on its map, one field per attribute."""
+    __slots__ = ("tag_xy", "tag_color", "tag_icon", "tag_popup", "line_xy", "line_color")
+    tag_xy: np.ndarray  # (M, 2) marker [lat, lng]
+    tag_color: List[str]  # named marker colors
+    tag_icon: List[str]
+    tag_popup: List[str]
+    line_xy: np.ndarray  # (L, 4) [start_lat, start_lng, end_lat, end_lng]
+    line_color: List[str]
+
+    def coords(self) -> np.ndarray:
+        """All (N, 2) [lat, lng] points: marker positions and line endpoints."""
+        return np.concatenate((self.tag_xy, self.line_xy.reshape(-1, 2)))
+
+def _frame_xy(frame: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """(M, 2) tag positions and (L, 4) line endpoints of a frame dictionary."""
+    tag_xy = np.asarray([tag["position"] for tag in frame.get("tags", [])], dtype=np.float64).reshape(-1, 2)
+    line_xy = np.asarray(
+        [line["start"] + line["end"] for line in frame.get("lines", [])], dtype=np.float64
+    ).reshape(-1, 4)
+    return tag_xy, line_xy
+
+def _to_soa(frame: Dict) -> _FrameArrays:
+    """Convert a frame dictionary from the JSON input to a _FrameArrays."""
+    tags = frame.get("tags", [])
+    lines = frame.get("lines", [])
+    icons = [tag.get("icon", _DEFAULT_ICON) for tag in tags]
+    tag_xy, line_xy = _frame_xy(frame)
+    return _FrameArrays(
+        tag_xy=tag_xy,
+        tag_color=[color_hex_to_folium_icon(tag.get("color", _DEFAULT_COLOR)) for tag in tags],
+        tag_icon=icons,
+        tag_popup=[
+            _POPUP_FORMAT.format(description=tag.get("description", ""), icon=icon)
+            for tag, icon in zip(tags, icons)
+        ],
+        line_xy=line_xy,
+        line_color=[line["color"] for line in lines],
+    )
+
+def _coords_bounds(coords: np.ndarray) -> List[List[float]]:
+    """Bounding box [[min_lat, min_lng], [max_lat, max_lng]] of a non-empty sequence of [lat, lng] pairs."""
+    arr = np.asarray(coords, dtype=np.float64)
+    mn = arr.min(axis=0)
+    mx = arr.max(axis=0)
+    return [[float(mn[0]), float(mn[1])], [float(mx[0]), float(mx[1])]]
+
+def _frame_bounds(frame: _FrameArrays, global_bounds: Optional[List[List[float]]]) -> Optional[List[List[float]]]:
+    """Bounds of a frame's points, or global_bounds if the frame draws nothing."""
+    coords = frame.coords()
+    return _coords_bounds(coords) if len(coords) else global_bounds
+
+def _render_frame_html(frame: _FrameArrays, global_bounds: Optional[List[List[float]]], tiles_js: str) -> str:
+    """Render the Leaflet HTML page for a single frame, with the tile layer given by tiles_js."""
+    parts = [_page_head(tiles_js)]
+    append = parts.append
+    for location, color, icon, popup in zip(frame.tag_xy.tolist(), frame.tag_color, frame.tag_icon, frame.tag_popup):
+        append(_MARKER_JS.format(
+            location=_tojson(location),
+            color=_tojson(color),
+            icon=_tojson(icon),
+            popup=_tojson(popup),
+        ))
+    for (start_lat, start_lng, end_lat, end_lng), color in zip(frame.line_xy.tolist(), frame.line_color):
+        locations = [[start_lat, start_lng], [end_lat, end_lng]]
+        append(_LINE_JS.format(locations=_tojson(locations), color=_tojson(color)))
+    bounds = _frame_bounds(frame, global_bounds)
+    if bounds:
+        append(_FIT_BOUNDS_JS.format(bounds=_tojson(bounds)))
+    append(_PAGE_TAIL)
+    return "".join(parts)
+
+def create_map_for_frame(frame: Dict, global_bounds: Optional[List[List[float]]], output_path: str,
+                         compress: bool = False) -> None:
+    """
+    Generate a Leaflet map for a single frame.
+    
+    Args:
+        frame: Dictionary containing frame data
+        global_bounds: Fallback map bounds [[min_lat, min_lng], [max_lat, max_lng]]
+        output_path: Path to save the HTML file
+        compress: Write gzip-compressed HTML to output_path + '.gz' instead
+            (for HTTP servers that serve pre-compressed files)
+    """
+    _write_html(output_path, _render_frame_html(_to_soa(frame), global_bounds, _tiles_js()), compress)
+
+def generate_master_html(output_dir: str, total_frames: int) -> None:
+    """
+    Create the master HTML file that controls all frames.
+    
+    Args:
+        output_dir: Directory to save the file
+        total_frames: Number of frames available
+    """
+    master_html_path = os.path.join(output_dir, "_master.html")
+    _write_html(master_html_path, _MASTER_TEMPLATE.format(total_frames=total_frames))
+
+def generate_combined_html(output_dir: str, frames: List[Dict],
+                           global_bounds: Optional[List[List[float]]]) -> None:
+    """
+    Create a single HTML file that holds all frames and switches between them in place.
+    
+    Args:
+        output_dir: Directory to save the file
+        frames: List of frame dictionaries from JSON input
+        global_bounds: Fallback map bounds [[min_lat, min_lng], [max_lat, max_lng]]
+    """
+    frames_data = []
+    for frame in frames:
+        arrays = _to_soa(frame)
+        frames_data.append({
+            "description": frame.get("description", ""),
+            "bounds": _frame_bounds(arrays, global_bounds),
+            "tag_xy": arrays.tag_xy,
+            "tag_color": arrays.tag_color,
+            "tag_icon": arrays.tag_icon,
+            "tag_popup": arrays.tag_popup,
+            "line_xy": arrays.line_xy,
+            "line_color": arrays.line_color,
+        })
+    # "<" only occurs inside JSON strings, where \u003c is equivalent and cannot close the script tag
+    frames_json = _dumps_json(frames_data).replace("<", "\\u003c")
+    tail = _COMBINED_TAIL.replace("/*TILES*/", _tiles_js())
+    _write_html(os.path.join(output_dir, "combined.html"), _COMBINED_HEAD + frames_json + tail)
+
+def _render_batch(batch: Iterable[Tuple[_FrameArrays, str]], global_bounds: Optional[List[List[float]]],
+                  compress: bool, tiles_js: str) -> None:
+    """Render a batch of (frame, output_path) jobs in one worker task."""
+    for frame, output_path in batch:
+        _write_html(output_path, _render_frame_html(frame, global_bounds, tiles_js), compress)
+
+def _unique_frames(frames: Iterable[Dict], output_dir: str, compress: bool,
+                   global_bounds: Optional[List[List[float]]], tiles_js: str, previous: Dict[str, str],
+                   hashes: Dict[str, str], links: List[Tuple[str, str]]) -> Iterator[Tuple[_FrameArrays, str]]:
+    """
+    Yield (frame arrays, output_path) for every frame that has to be rendered.
+
+    The key of every event file is recorded in hashes. A file that exists and
+    has the same key in previous (the last run) is left untouched. A frame whose
+    key was already rendered in this run is not yielded; its (source, target)
+    file pair is appended to links instead, to be linked once the source exists.
+    """
+    suffix = ".gz" if compress else ""
+    seen = {}
+    for i, frame in enumerate(frames):
+        output_path = os.path.join(output_dir, f"event_{i}.html")
+        target = output_path + suffix
+        name = os.path.basename(target)
+        key = _frame_key(frame, global_bounds, tiles_js)
+        hashes[name] = key
+        unchanged = previous.get(name) == key and os.path.exists(target)
+        if key in seen:
+            if not unchanged:
+                links.append((seen[key], target))
+        else:
+            seen[key] = target
+            if not unchanged:
+                yield _to_soa(frame), output_path
+
+def render_osm_maps(input_file: str = DEFAULT_INPUT_FILE, output_dir: str = DEFAULT_OUTPUT_DIR,
+                    max_workers: Optional[int] = 1, compress: bool = False,
+                    combined: bool = False) -> None:
     """
     Main function to render OSM data from JSON to interactive maps.
     
     Args:
         input_file: Path to JSON input file (default: 'route.json')
         output_dir: Output directory for HTML files (default: 'route_output')
+        max_workers: Number of worker processes for rendering frames
+            (default: 1, render in the current process; None: one per CPU).
+            With more than one worker, scripts calling this function need an
+            ``if __name__ == "__main__":`` guard on platforms that start worker
+            processes with spawn (the default on macOS and Windows)
+        compress: Write the per-frame maps as gzip-compressed event_N.html.gz
+        combined: Write a single combined.html holding all frames instead of
+            one event_N.html per frame plus the _master.html/all_frames.html views
+
+    Re-running into the same output_dir only re-renders event files whose map
+    content changed; delete output_dir/.hashes.json to force a full render.
     """
-    with open(input_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    frames = _load_frames(input_file)
+
+    # First pass: global bounds as fallback and the descriptions for the summary
+    corners = []
+    summaries = []
+    for frame in frames:
+        summaries.append({"description": frame.get("description", "")})
+        tag_xy, line_xy = _frame_xy(frame)
+        coords = np.concatenate((tag_xy, line_xy.reshape(-1, 2)))
+        if len(coords):
+            corners.extend(_coords_bounds(coords))
 
-    frames = data["frames"]
+    global_bounds = _coords_bounds(corners) if corners else None
     os.makedirs(output_dir, exist_ok=True)
 
-    # Calculate global bounds as fallback
-    all_coords = []
-    for frame in frames:
-        for tag in frame.get("tags", []):
-            all_coords.append(tag["position"])
-        for line in frame.get("lines", []):
-            all_coords.append(line["start"])
-            all_coords.append(line["end"])
-    
-    if all_coords:
-        lats, lngs = zip(*all_coords)
-        global_bounds = [[min(lats), min(lngs)], [max(lats), max(lngs)]]
-    else:
-        global_bounds = None
+    if combined:
+        generate_combined_html(output_dir, frames, global_bounds)
+        print(f"Rendering complete! Open '{os.path.join(output_dir, 'combined.html')}' in your browser.")
+        print("Use the Previous/Next buttons to navigate between frames.")
+        return
 
     # Generate summary HTML
-    all_frames_html = summarize_frames(frames)
-    with open(os.path.join(output_dir, "all_frames.html"), "w", encoding="utf-8") as f:
-        f.write(all_frames_html)
+    _write_html(os.path.join(output_dir, "all_frames.html"), summarize_frames(summaries))
 
-    # Generate individual maps
-    for i, frame in enumerate(frames):
-        create_map_for_frame(
-            frame=frame,
-            global_bounds=global_bounds,
-            output_path=os.path.join(output_dir, f"event_{i}.html")
-        )
+    # Second pass: generate individual maps (frames are independent, so render them in parallel).
+    # Frames drawing the same tags and lines are rendered once and hard-linked afterwards,
+    # frames unchanged since the last run (per the .hashes.json sidecar) are skipped.
+    hashes_path = Path(output_dir) / ".hashes.json"
+    previous = {}
+    if hashes_path.exists():
+        previous = json.loads(hashes_path.read_text(encoding="utf-8"))
+        # Drop the sidecar until this run completes: an interrupted run leaves
+        # rewritten event files that no longer match the recorded hashes
+        hashes_path.unlink()
+    hashes = {}
+    links = []
+    # Tile layer from the current GOOGLE_MAPS_API_KEY, passed on since spawned workers re-import the module
+    tiles_js = _tiles_js()
+    jobs = _unique_frames(frames, output_dir, compress, global_bounds, tiles_js, previous, hashes, links)
+    if max_workers == 1:
+        _render_batch(jobs, global_bounds, compress, tiles_js)
+    else:
+        # Hand frames to workers in batches and bound the batches in flight,
+        # so a streamed input is never fully held in memory
+        max_pending = 2 * (max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = set()
+            for batch in iter(lambda: list(islice(jobs, _FRAMES_PER_TASK)), []):
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(executor.submit(_render_batch, batch, global_bounds, compress, tiles_js))
+            for future in pending:
+                future.result()
+    for source, target in links:
+        _link_or_copy(source, target)
+    hashes_path.write_text(json.dumps(hashes), encoding="utf-8")
 
     # Generate master controller
-    generate_master_html(output_dir, len(frames))
+    generate_master_html(output_dir, len(summaries))
 
     print(f"Rendering complete! Open '{os.path.join(output_dir, '_master.html')}' in your browser.")
     print("Use the Previous/Next buttons to navigate between frames.")
 
 if __name__ == "__main__":
     import argparse
-    parser = argparse.ArgumentParser(description="OSM Renderer using Folium")
+    parser = argparse.ArgumentParser(description="OSM Renderer using Leaflet")
     parser.add_argument("--input", default=DEFAULT_INPUT_FILE, help="Input JSON file")
     parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR, help="Output directory")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes (default: 1, 0 for one per CPU)")
+    parser.add_argument("--compress", action="store_true", help="Write per-frame maps as .html.gz")
+    parser.add_argument("--combined", action="store_true", help="Write all frames into a single combined.html")
     args = parser.parse_args()
     
-    render_osm_maps(input_file=args.input, output_dir=args.output)
\ No newline at end of file
+    render_osm_maps(input_file=args.input, output_dir=args.output, max_workers=args.workers or None,
+                    compress=args.compress, combined=args.combined)
\ No newline at end of file
@@ -1,8 +1,12 @@
+import gzip
 import os
+import subprocess
+import sys
 import json
 import tempfile
 import pytest
 from pathlib import Path
+from simpleosmrenderer import renderer
 from simpleosmrenderer.renderer import (  
     summarize_frames,
     color_hex_to_folium_icon,
@@ -15,6 +19,7 @@ def test_summarize_frames_generates_html():
     frames = [
         {"description": "Tag at location A"},
         {"description": "Emergency at <location B>"},
+        {"description": "Fish & Chips"},
         {"description": ""}  # Test empty description
     ]
     html_output = summarize_frames(frames)
@@ -29,6 +34,7 @@ def test_summarize_frames_generates_html():
     assert "Emergency at &lt;location B&gt;" in html_output
 
     assert "Emergency at &lt;location B&gt;" in html_output
+    assert "Fish &amp; Chips" in html_output
 
 @pytest.mark.parametrize("hex_code,expected_color", [
     ("#FF0000", "red"),        # Exact match
@@ -97,4 +103,207 @@ def test_render_osm_maps_function(tmp_path):
     # Verify outputs
     assert (output_dir / "all_frames.html").exists()
     assert (output_dir / "event_0.html").exists()
-    assert (output_dir / "_master.html").exists()
\ No newline at end of file
+    assert (output_dir / "_master.html").exists()
+
+@pytest.fixture(params=["json", "ijson"])
+def loader(request, monkeypatch):
+    """Load input with the json module, or stream it with ijson when installed."""
+    if request.param == "ijson":
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(renderer, "ijson", None)
+    return request.param
+
+@pytest.fixture(params=["json", "orjson"])
+def serializer(request, monkeypatch):
+    """Serialize embedded JSON and frame keys with the json module, or with orjson when installed."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(renderer, "orjson", None)
+    return request.param
+
+def _write_input(tmp_path, frames):
+    """Write frames as a JSON input file and return its path."""
+    input_file = tmp_path / "test.json"
+    input_file.write_text(json.dumps({"frames": frames}), encoding="utf-8")
+    return str(input_file)
+
+def test_render_osm_maps_serial_matches_parallel(tmp_path, loader, serializer):
+    """Rendering in-process and in a process pool writes the same files."""
+    input_file = _write_input(tmp_path, [
+        {"description": "A", "tags": [{"position": [51.5, -0.1], "description": "P"}]},
+        {"description": "B", "lines": [{"start": [51.5, -0.1], "end": [51.6, -0.2], "color": "#FF0000"}]},
+    ])
+
+    render_osm_maps(input_file=input_file, output_dir=str(tmp_path / "serial"), max_workers=1)
+    render_osm_maps(input_file=input_file, output_dir=str(tmp_path / "pool"), max_workers=2)
+
+    serial = sorted(p.name for p in (tmp_path / "serial").iterdir())
+    pool = sorted(p.name for p in (tmp_path / "pool").iterdir())
+    assert serial == pool
+    assert "event_1.html" in pool
+    for i in range(2):
+        name = f"event_{i}.html"
+        assert (tmp_path / "pool" / name).read_bytes() == (tmp_path / "serial" / name).read_bytes()
+
+def test_create_map_for_frame_compressed(tmp_path):
+    """compress=True writes a gzip file next to the requested path."""
+    frame = {"tags": [{"position": [51.5, -0.1], "description": "Test Hospital"}]}
+    output_path = tmp_path / "map.html"
+    create_map_for_frame(frame, None, str(output_path), compress=True)
+
+    assert not output_path.exists()
+    with gzip.open(str(output_path) + ".gz", "rt", encoding="utf-8") as f:
+        content = f.read()
+    assert "Test Hospital" in content
+    assert "<!DOCTYPE html>" in content
+
+def test_render_osm_maps_combined(tmp_path, loader, serializer):
+    """combined=True writes one page that embeds every frame."""
+    input_file = _write_input(tmp_path, [
+        {"description": "First <frame>", "tags": [{"position": [51.5, -0.1], "description": "P"}]},
+        {"description": "Second", "lines": [{"start": [51.5, -0.1], "end": [51.6, -0.2], "color": "#FF0000"}]},
+    ])
+    output_dir = tmp_path / "output"
+
+    render_osm_maps(input_file=input_file, output_dir=str(output_dir), combined=True)
+
+    assert sorted(p.name for p in output_dir.iterdir()) == ["combined.html"]
+    content = (output_dir / "combined.html").read_text(encoding="utf-8")
+    assert "leaflet.js" in content
+    assert "First \\u003cframe>" in content
+    assert "#FF0000" in content
+
+def test_render_osm_maps_links_repeated_frames(tmp_path, monkeypatch):
+    """Frames with identical tags and lines are rendered once and hard-linked."""
+    tags = [{"position": [51.5, -0.1], "description": "P"}]
+    input_file = _write_input(tmp_path, [
+        {"description": "First", "tags": tags},
+        {"description": "Second", "tags": tags},
+        {"description": "Third", "tags": [{"position": [51.6, -0.1], "description": "Q"}]},
+    ])
+    output_dir = tmp_path / "output"
+    rendered = []
+    render_frame_html = renderer._render_frame_html
+
+    def counting_render_frame_html(frame, global_bounds, tiles_js):
+        rendered.append(frame)
+        return render_frame_html(frame, global_bounds, tiles_js)
+
+    monkeypatch.setattr(renderer, "_render_frame_html", counting_render_frame_html)
+    render_osm_maps(input_file=input_file, output_dir=str(output_dir), max_workers=1)
+
+    assert len(rendered) == 2
+    assert os.path.samefile(output_dir / "event_0.html", output_dir / "event_1.html")
+    assert not os.path.samefile(output_dir / "event_0.html", output_dir / "event_2.html")
+
+def test_render_osm_maps_skips_unchanged_frames(tmp_path, loader, serializer):
+    """Re-running only rewrites event files whose map content changed."""
+    frames = [
+        {"description": "First", "tags": [{"position": [51.5, -0.1], "description": "P"}]},
+        {"description": "Second", "tags": [{"position": [51.6, -0.1], "description": "Q"}]},
+    ]
+    input_file = _write_input(tmp_path, frames)
+    output_dir = tmp_path / "output"
+
+    render_osm_maps(input_file=input_file, output_dir=str(output_dir), max_workers=1)
+    assert (output_dir / ".hashes.json").exists()
+    for name in ("event_0.html", "event_1.html"):
+        (output_dir / name).write_text("untouched", encoding="utf-8")
+
+    # Description-only edits do not change the maps
+    frames[0]["description"] = "First (edited)"
+    frames[1]["tags"][0]["position"] = [51.7, -0.1]
+    _write_input(tmp_path, frames)
+    render_osm_maps(input_file=input_file, output_dir=str(output_dir), max_workers=1)
+
+    assert (output_dir / "event_0.html").read_text(encoding="utf-8") == "untouched"
+    assert "[51.7, -0.1]" in (output_dir / "event_1.html").read_text(encoding="utf-8")
+    assert "First (edited)" in (output_dir / "all_frames.html").read_text(encoding="utf-8")
+
+def test_render_osm_maps_interrupted_run_invalidates_hashes(tmp_path, monkeypatch):
+    """Files rewritten by an interrupted run are re-rendered on the next run."""
+    frames_a = [
+        {"description": "First", "tags": [{"position": [51.5, -0.1], "description": "Version A"}]},
+        {"description": "Second", "tags": [{"position": [51.6, -0.1], "description": "Other"}]},
+    ]
+    frames_b = [
+        {"description": "First", "tags": [{"position": [51.5, -0.1], "description": "Version B"}]},
+        {"description": "Second", "tags": [{"position": [51.7, -0.1], "description": "Other"}]},
+    ]
+    output_dir = tmp_path / "output"
+    render_osm_maps(input_file=_write_input(tmp_path, frames_a), output_dir=str(output_dir), max_workers=1)
+
+    # Render B but fail after event_0.html has been rewritten
+    render_frame_html = renderer._render_frame_html
+    calls = []
+
+    def failing_render_frame_html(frame, global_bounds, tiles_js):
+        calls.append(frame)
+        if len(calls) > 1:
+            raise RuntimeError("interrupted")
+        return render_frame_html(frame, global_bounds, tiles_js)
+
+    monkeypatch.setattr(renderer, "_render_frame_html", failing_render_frame_html)
+    with pytest.raises(RuntimeError):
+        render_osm_maps(input_file=_write_input(tmp_path, frames_b), output_dir=str(output_dir), max_workers=1)
+    assert "Version B" in (output_dir / "event_0.html").read_text(encoding="utf-8")
+    monkeypatch.setattr(renderer, "_render_frame_html", render_frame_html)
+
+    render_osm_maps(input_file=_write_input(tmp_path, frames_a), output_dir=str(output_dir), max_workers=1)
+    assert "Version A" in (output_dir / "event_0.html").read_text(encoding="utf-8")
+
+@pytest.mark.parametrize("script", [
+    # README Quick Start, run as a script without a __main__ guard
+    "render_osm_maps(input_file={input_file!r}, output_dir={output_dir!r})\n",
+    'if __name__ == "__main__":\n'
+    "    render_osm_maps(input_file={input_file!r}, output_dir={output_dir!r}, max_workers=2)\n",
+])
+def test_render_osm_maps_spawn_start_method(tmp_path, script):
+    """Rendering works where worker processes are spawned (the default on macOS and Windows)."""
+    input_file = _write_input(tmp_path, [
+        {"description": "A", "tags": [{"position": [51.5, -0.1], "description": "P"}]},
+        {"description": "B", "tags": [{"position": [51.6, -0.1], "description": "Q"}]},
+    ])
+    output_dir = tmp_path / "output"
+    script_file = tmp_path / "script.py"
+    script_file.write_text(
+        "import multiprocessing\n"
+        "multiprocessing.set_start_method('spawn', force=True)\n"
+        "from simpleosmrenderer.renderer import render_osm_maps\n"
+        + script.format(input_file=input_file, output_dir=str(output_dir)),
+        encoding="utf-8",
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(Path(__file__).parents[1]), env.get("PYTHONPATH")]))
+
+    subprocess.run([sys.executable, str(script_file)], cwd=str(tmp_path), env=env, check=True, timeout=120)
+
+    for name in ("all_frames.html", "event_0.html", "event_1.html", "_master.html"):
+        assert (output_dir / name).exists()
+
+def test_render_osm_maps_missing_frames_key(tmp_path, loader):
+    """Input without a "frames" key fails before any output is written."""
+    input_file = tmp_path / "test.json"
+    input_file.write_text(json.dumps({"events": []}), encoding="utf-8")
+    output_dir = tmp_path / "output"
+
+    with pytest.raises(KeyError):
+        render_osm_maps(input_file=str(input_file), output_dir=str(output_dir))
+    assert not output_dir.exists()
+
+def test_google_maps_api_key_set_after_import(tmp_path, monkeypatch):
+    """GOOGLE_MAPS_API_KEY is read on every render, not only at import time."""
+    frame = {"tags": [{"position": [51.5, -0.1], "description": "P"}]}
+    input_file = _write_input(tmp_path, [dict(frame, description="A")])
+
+    create_map_for_frame(frame, None, str(tmp_path / "osm.html"))
+    monkeypatch.setattr(renderer, "GOOGLE_MAPS_API_KEY", "test-key")
+    create_map_for_frame(frame, None, str(tmp_path / "google.html"))
+    render_osm_maps(input_file=input_file, output_dir=str(tmp_path / "output"), combined=True)
+
+    assert "tile.openstreetmap.org" in (tmp_path / "osm.html").read_text(encoding="utf-8")
+    for path in (tmp_path / "google.html", tmp_path / "output" / "combined.html"):
+        content = path.read_text(encoding="utf-8")
+        assert "mt1.google.com" in content and "test-key" in content